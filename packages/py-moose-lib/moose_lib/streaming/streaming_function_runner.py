@@ -54,6 +54,11 @@ PARTITION_ASSIGNMENT_TIMEOUT_SECONDS = 60
 # Polling interval (seconds) when waiting for partition assignment
 PARTITION_ASSIGNMENT_POLL_INTERVAL_SECONDS = 0.1
 
+# Constants for producer batching
+# Upper bound (bytes) for a single record batch per partition, capped at the
+# target topic's max message size
+PRODUCER_BATCH_SIZE = 64 * 1024
+
 
 @dataclasses.dataclass
 class KafkaTopicConfig:
@@ -373,6 +378,10 @@ def create_producer() -> Optional[KafkaProducer]:
         sasl_mechanism=sasl_config.get("mechanism"),
         security_protocol=args.security_protocol,
         max_request_size=max_request_size,
+        # Outputs of a polled batch (including every element of a transform
+        # returning a list) are sent asynchronously and flushed once; with one
+        # request in flight they accumulate, so allow larger record batches
+        batch_size=min(PRODUCER_BATCH_SIZE, max_request_size),
     )
 
 
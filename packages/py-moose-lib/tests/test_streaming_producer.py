@@ -0,0 +1,75 @@
+"""Tests for the streaming function runner's producer configuration."""
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+
+def _topic_json(name: str, max_message_bytes: int) -> str:
+    return json.dumps(
+        {
+            "streaming_engine_type": "Topic",
+            "name": name,
+            "partitions": 1,
+            "retention_ms": 60000,
+            "max_message_bytes": max_message_bytes,
+        }
+    )
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """Import the runner module, which parses its CLI arguments at import time."""
+    # The runner reopens sys.stdout's file descriptor unbuffered on import and its
+    # wrapper owns that descriptor; hand it a duplicate so closing the wrapper
+    # cannot close pytest's capture file
+    stdout = open(os.dup(sys.stdout.fileno()), "w", closefd=False)
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "streaming_function_runner",
+            _topic_json("source", 1048576),
+            "/tmp",
+            "main",
+            "localhost:9092",
+        ],
+    )
+    sys.modules.pop("moose_lib.streaming.streaming_function_runner", None)
+    module = importlib.import_module("moose_lib.streaming.streaming_function_runner")
+    yield module
+    sys.modules.pop("moose_lib.streaming.streaming_function_runner", None)
+
+
+def _producer_kwargs(runner, monkeypatch, target_topic):
+    captured = {}
+    monkeypatch.setattr(runner, "target_topic", target_topic)
+    monkeypatch.setattr(
+        runner, "get_kafka_producer", lambda **kwargs: captured.update(kwargs)
+    )
+    runner.create_producer()
+    return captured
+
+
+def test_producer_batch_size_defaults_to_constant(runner, monkeypatch):
+    target = runner.KafkaTopicConfig(**json.loads(_topic_json("target", 1048576)))
+    kwargs = _producer_kwargs(runner, monkeypatch, target)
+    assert kwargs["batch_size"] == runner.PRODUCER_BATCH_SIZE
+    assert kwargs["max_request_size"] == 1048576
+
+
+def test_producer_batch_size_capped_at_max_request_size(runner, monkeypatch):
+    target = runner.KafkaTopicConfig(**json.loads(_topic_json("target", 1024)))
+    kwargs = _producer_kwargs(runner, monkeypatch, target)
+    assert kwargs["max_request_size"] == 1024
+    assert kwargs["batch_size"] == 1024
+
+
+def test_producer_does_not_set_linger(runner, monkeypatch):
+    target = runner.KafkaTopicConfig(**json.loads(_topic_json("target", 1048576)))
+    kwargs = _producer_kwargs(runner, monkeypatch, target)
+    assert "linger_ms" not in kwargs
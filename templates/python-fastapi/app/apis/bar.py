@@ -5,24 +5,80 @@ This file demonstrates how to use FastAPI with MooseStack for consumption
 APIs using the WebApp class.
 """
 
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, Response, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from moose_lib.dmv2 import WebApp, WebAppConfig, WebAppMetadata
 from moose_lib.dmv2.web_app_helpers import get_moose_utils
 from app.db.views import bar_aggregated_mv
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
-from datetime import datetime
+from typing import Any, Optional, Literal
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import time
+
+# Log records are queued and written to stdout by a background thread, so
+# request handlers never block on I/O. Moose treats unstructured stderr lines as
+# errors, so the handler must not use StreamHandler's stderr default.
+logger = logging.getLogger("bar")
+logger.setLevel(os.environ.get("WEBAPP_LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 app = FastAPI()
 
 
-# Middleware to log requests
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    print(f"[bar.py] {request.method} {request.url.path}")
-    response = await call_next(request)
-    return response
+# Middleware to log requests and handle unhandled errors
+class LogAndErrorMiddleware:
+    """Plain ASGI middleware that logs each request and turns unhandled
+    exceptions into a JSON 500, so a single layer wraps every request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[bar.py] %s %s", scope["method"], scope["path"])
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error("FastAPI error", exc_info=exc)
+            if response_started:
+                raise
+            error_response = JSONResponse(
+                status_code=500,
+                content={
+                    "error": "Internal Server Error",
+                    "message": str(exc),
+                },
+            )
+            await error_response(scope, receive, send)
+
+
+app.add_middleware(LogAndErrorMiddleware)
 
 
 # JWT authentication dependency
@@ -34,20 +90,95 @@ async def require_auth(request: Request):
     return moose
 
 
+# Response models let FastAPI serialize straight to JSON bytes through
+# Pydantic's Rust core instead of jsonable_encoder + json.dumps
+class HealthResponse(BaseModel):
+    status: str
+    timestamp: str
+    service: str
+
+
+class QueryResponse(BaseModel):
+    success: bool
+    count: int
+    data: list[dict[str, Any]]
+
+
+# Short-lived in-process cache of /query and /data responses. BarAggregated
+# changes slowly and the parameter space is small, so repeated requests within
+# the TTL skip the ClickHouse round trip.
+_RESPONSE_CACHE_TTL_SECONDS = 5.0
+_RESPONSE_CACHE_MAX_ENTRIES = 128
+_response_cache: dict[tuple, tuple[float, Any]] = {}
+
+
+def _cache_get(key: tuple, now: float) -> Optional[Any]:
+    cached = _response_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    return None
+
+
+def _cache_put(key: tuple, now: float, response: Any) -> None:
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+        _response_cache.clear()
+    _response_cache[key] = (now + _RESPONSE_CACHE_TTL_SECONDS, response)
+
+
+# /query responses carry an ETag and a max-age matching the in-process TTL, so
+# clients and proxies can revalidate with If-None-Match and get a bodyless 304
+_CACHE_CONTROL = f"public, max-age={int(_RESPONSE_CACHE_TTL_SECONDS)}"
+
+
+def _etag(response: dict) -> str:
+    payload = json.dumps(response, sort_keys=True, default=str).encode()
+    return f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
+# /query text is fixed, so it is built once and limit is bound as a typed
+# ClickHouse query parameter
+_QUERY_SQL = """
+    SELECT
+        day_of_month,
+        total_rows
+    FROM BarAggregated
+    ORDER BY total_rows DESC
+    LIMIT {limit: UInt32}
+"""
+
+
+# Last formatted health timestamp as [epoch_second, iso_string]; the payload
+# only has 1-second resolution, so probes within the same second reuse it
+_health_timestamp = [0, ""]
+
+
 # Health check endpoint
-@app.get("/health")
+@app.get("/health", response_model=HealthResponse)
 async def health():
     """Health check endpoint"""
+    now = int(time.time())
+    if now != _health_timestamp[0]:
+        _health_timestamp[0] = now
+        _health_timestamp[1] = datetime.fromtimestamp(now, timezone.utc).isoformat()
     return {
         "status": "ok",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _health_timestamp[1],
         "service": "bar-fastapi-api",
     }
 
 
 # Query endpoint with URL parameters
-@app.get("/query")
-async def query(request: Request, limit: int = 10):
+@app.get("/query", response_model=QueryResponse)
+async def query(request: Request, response: Response, limit: int = 10):
     """
     Query aggregated bar data.
 
@@ -55,6 +186,8 @@ async def query(request: Request, limit: int = 10):
     - Accessing MooseStack utilities via get_moose_utils
     - Using the QueryClient to execute queries
     - Using query parameters for filtering
+    - Caching responses in-process for a few seconds
+    - Conditional requests with ETag / If-None-Match
     """
     moose = get_moose_utils(request)
     if not moose:
@@ -62,27 +195,30 @@ async def query(request: Request, limit: int = 10):
             status_code=500, detail="MooseStack utilities not available"
         )
 
-    try:
-        # Build the query with safe parameterization
-        query_str = """
-            SELECT
-                day_of_month,
-                total_rows
-            FROM BarAggregated
-            ORDER BY total_rows DESC
-            LIMIT {limit}
-        """
-
-        result = moose.client.query.execute(query_str, {"limit": limit})
-
-        return {
+    cache_key = ("query", limit)
+    now = time.monotonic()
+    cached = _cache_get(cache_key, now)
+    if cached is None:
+        try:
+            result = moose.client.query.execute_raw(_QUERY_SQL, {"limit": limit})
+        except Exception as error:
+            logger.exception("Query error")
+            raise HTTPException(status_code=500, detail=str(error))
+
+        body = {
             "success": True,
             "count": len(result),
             "data": result,
         }
-    except Exception as error:
-        print(f"Query error: {error}")
-        raise HTTPException(status_code=500, detail=str(error))
+        cached = (body, _etag(body))
+        _cache_put(cache_key, now, cached)
+
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return body
 
 
 # POST endpoint with request body validation
@@ -99,7 +235,37 @@ class DataRequest(BaseModel):
     end_day: int = Field(default=31, gt=0, le=31, description="End day of month")
 
 
-@app.post("/data")
+# One prebuilt query per order_by column. The column is bound by the
+# DataRequest Literal, so only numeric filters are passed as query parameters.
+_DATA_QUERIES = {
+    column: f"""
+        SELECT
+            day_of_month,
+            {column}
+        FROM BarAggregated
+        WHERE
+            day_of_month >= {{start_day: UInt8}}
+            AND day_of_month <= {{end_day: UInt8}}
+        ORDER BY {column} DESC
+        LIMIT {{limit: UInt32}}
+    """
+    for column in (
+        "total_rows",
+        "rows_with_text",
+        "max_text_length",
+        "total_text_length",
+    )
+}
+
+
+class DataResponse(BaseModel):
+    success: bool
+    params: DataRequest
+    count: int
+    data: list[dict[str, Any]]
+
+
+@app.post("/data", response_model=DataResponse)
 async def data(request: Request, body: DataRequest):
     """
     Query aggregated bar data with filters.
@@ -107,7 +273,8 @@ async def data(request: Request, body: DataRequest):
     This endpoint demonstrates:
     - POST request handling
     - Request body validation with Pydantic
-    - Dynamic query building based on request parameters
+    - Picking a prebuilt query based on request parameters
+    - Caching responses in-process for a few seconds
     """
     moose = get_moose_utils(request)
     if not moose:
@@ -115,32 +282,23 @@ async def data(request: Request, body: DataRequest):
             status_code=500, detail="MooseStack utilities not available"
         )
 
+    cache_key = ("data", body.order_by, body.limit, body.start_day, body.end_day)
+    now = time.monotonic()
+    cached = _cache_get(cache_key, now)
+    if cached is not None:
+        return cached
+
     try:
-        # Build the query with safe parameterization
-        query_str = """
-            SELECT
-                day_of_month,
-                {select_column}
-            FROM BarAggregated
-            WHERE
-                day_of_month >= {start_day}
-                AND day_of_month <= {end_day}
-            ORDER BY {order_by} DESC
-            LIMIT {limit}
-        """
-
-        result = moose.client.query.execute(
-            query_str,
+        result = moose.client.query.execute_raw(
+            _DATA_QUERIES[body.order_by],
             {
-                "select_column": body.order_by,
-                "order_by": body.order_by,
                 "start_day": body.start_day,
                 "end_day": body.end_day,
                 "limit": body.limit,
             },
         )
 
-        return {
+        response = {
             "success": True,
             "params": {
                 "order_by": body.order_by,
@@ -151,8 +309,10 @@ async def data(request: Request, body: DataRequest):
             "count": len(result),
             "data": result,
         }
+        _cache_put(cache_key, now, response)
+        return response
     except Exception as error:
-        print(f"Query error: {error}")
+        logger.exception("Query error")
         raise HTTPException(status_code=500, detail=str(error))
 
 
@@ -173,19 +333,6 @@ async def protected(moose=Depends(require_auth)):
     }
 
 
-# Global error handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    print(f"FastAPI error: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal Server Error",
-            "message": str(exc),
-        },
-    )
-
-
 # Register the FastAPI app as a WebApp
 bar_fastapi_app = WebApp(
     "barFastApi",
@@ -3,16 +3,47 @@
 
 from app.db.models import foo_pipeline, bar_pipeline, Foo, Bar
 from moose_lib import DeadLetterQueue, DeadLetterModel, MooseCache
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+import sys
+
+# Consumer output is queued and written to stdout by a background thread, so
+# the streaming functions never block on I/O. Foo events are logged at DEBUG;
+# set TRANSFORM_LOG_LEVEL=DEBUG to see them.
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get("TRANSFORM_LOG_LEVEL", "WARNING").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Bar is cheap to derive from Foo, so a cache lookup usually costs more than
+# recomputing it. Set BAR_CACHE=1 to turn the MooseCache round-trip back on.
+_CACHE_ENABLED = os.environ.get("BAR_CACHE", "").lower() in ("1", "true")
+_CACHE_KEY_PREFIX = "foo_to_bar:"
+_UTC = timezone.utc
+
+
+@lru_cache(maxsize=None)
+def _get_cache() -> MooseCache:
+    """Create the MooseCache client on first use and reuse it afterwards"""
+    return MooseCache()
 
 
 def foo_to_bar(foo: Foo) -> Bar:
     """Transform Foo events to Bar events with error handling and caching.
 
     Normal flow:
-    1. Check cache for previously processed events
+    1. Check cache for previously processed events (when BAR_CACHE is set)
     2. Transform Foo to Bar
-    3. Cache the result
+    3. Cache the result (when BAR_CACHE is set)
     4. Return transformed Bar event
 
     Alternate flow (DLQ):
@@ -20,25 +51,27 @@ def foo_to_bar(foo: Foo) -> Bar:
     - This enables separate error handling, monitoring, and retry strategies
     """
 
-    # Create a cache
-    cache = MooseCache()
-    cache_key = f"foo_to_bar:{foo.primary_key}"
+    if _CACHE_ENABLED:
+        cache = _get_cache()
+        cache_key = _CACHE_KEY_PREFIX + foo.primary_key
 
-    # Check for cached transformation result
-    cached_result = cache.get(cache_key)
-    if cached_result:
-        return cached_result
+        # Check for cached transformation result
+        cached_result = cache.get(cache_key)
+        if cached_result:
+            return cached_result
 
-    # Transform the data
-    result = Bar(
+    text = foo.optional_text
+    # Every field comes from an already-validated Foo, so skip re-validation
+    result = Bar.model_construct(
         primary_key=foo.primary_key,
-        utc_timestamp=datetime.fromtimestamp(foo.timestamp),
-        has_text=foo.optional_text is not None,
-        text_length=len(foo.optional_text) if foo.optional_text else 0,
+        utc_timestamp=datetime.fromtimestamp(foo.timestamp, _UTC),
+        has_text=text is not None,
+        text_length=0 if text is None else len(text),
     )
 
-    # Store the result in cache
-    cache.set(cache_key, result, 3600)  # Cache for 1 hour
+    if _CACHE_ENABLED:
+        # Store the result in cache
+        cache.set(cache_key, result, 3600)  # Cache for 1 hour
     return result
 
 
@@ -49,13 +82,16 @@ foo_pipeline.get_stream().add_transform(
 )
 
 
-# Add a streaming consumer to print Foo events
+# Add a streaming consumer to log Foo events (DEBUG, so a no-op by default)
 def print_foo_event(foo: Foo):
-    print(f"Received Foo event:")
-    print(f"  Primary Key: {foo.primary_key}")
-    print(f"  Timestamp: {datetime.fromtimestamp(foo.timestamp)}")
-    print(f"  Optional Text: {foo.optional_text or 'None'}")
-    print("---")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug(
+        "Received Foo event: primary_key=%s timestamp=%s optional_text=%s",
+        foo.primary_key,
+        datetime.fromtimestamp(foo.timestamp),
+        foo.optional_text,
+    )
 
 
 foo_pipeline.get_stream().add_consumer(print_foo_event)
@@ -63,9 +99,11 @@ foo_pipeline.get_stream().add_consumer(print_foo_event)
 
 # DLQ consumer for handling failed events (alternate flow)
 def print_dead_letter_messages(dead_letter: DeadLetterModel[Foo]):
-    print("Dead letter event received:")
-    print(f"  Error: {dead_letter.error}")
-    print(f"  Original data: {dead_letter.as_typed()}")
+    logger.warning(
+        "Dead letter event received: error=%s original_data=%s",
+        dead_letter.error_message,
+        dead_letter.original_record,
+    )
 
 
 foo_pipeline.get_dead_letter_queue().add_consumer(print_dead_letter_messages)
@@ -11,9 +11,30 @@ from moose_lib import (
     TaskContext,
 )
 from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor
 from faker import Faker
 from app.db.models import Foo, foo_pipeline
+import atexit
+import random
 import requests
+from requests.adapters import HTTPAdapter
+import time
+import uuid
+
+# Faker is built once per worker; weighting is irrelevant for synthetic text
+_FAKE = Faker(use_weighting=False)
+
+# Timestamps are drawn uniformly from the last year
+_ONE_YEAR_SECONDS = 365 * 24 * 60 * 60
+
+# Number of ingest POSTs kept in flight while the stream sends run
+_HTTP_WORKERS = 16
+
+# Shared HTTP session so the ingest POSTs reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.headers["Content-Type"] = "application/json"
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=_HTTP_WORKERS))
+atexit.register(_SESSION.close)
 
 
 class FooWorkflow(BaseModel):
@@ -26,76 +47,94 @@ class FooWorkflow(BaseModel):
 
 workflow_table = OlapTable[FooWorkflow]("foo_workflow")
 
+# Number of status rows buffered before each workflow_table insert
+_INSERT_BATCH_SIZE = 500
+
+
+def _post_foo(foo: Foo) -> dict:
+    """Send one Foo through the HTTP ingest API and return its status row"""
+    try:
+        req = _SESSION.post(
+            "http://localhost:4000/ingest/Foo",
+            data=foo.model_dump_json().encode("utf-8"),
+        )
+        if req.status_code == 200:
+            return {
+                "id": "1",
+                "success": True,
+                "message": f"HTTP inserted: {foo.primary_key}",
+            }
+        return {
+            "id": "1",
+            "success": False,
+            "message": f"HTTP failed: {req.status_code}",
+        }
+    except Exception as e:
+        return {"id": "1", "success": False, "message": f"HTTP error: {e}"}
+
 
 def run_task(ctx: TaskContext[None]) -> None:
     """Generate test data and send via HTTP and direct stream"""
-    fake = Faker()
+    fake = _FAKE
+    now = time.time()
 
-    for i in range(1000):
-        base_ts = fake.date_time_between(start_date="-1y", end_date="now").timestamp()
+    # Generate every payload up front so the loop below only does I/O
+    payloads = []
+    for _ in range(1000):
+        base_ts = random.uniform(now - _ONE_YEAR_SECONDS, now)
 
         # HTTP path payload
         foo_http = Foo(
-            primary_key=fake.uuid4(),
+            primary_key=str(uuid.uuid4()),
             timestamp=base_ts,
-            optional_text=fake.text() if fake.boolean() else None,
+            optional_text=fake.text() if random.random() < 0.5 else None,
         )
 
         # Direct send payload
         foo_send = Foo(
-            primary_key=fake.uuid4(),
+            primary_key=str(uuid.uuid4()),
             timestamp=base_ts,
-            optional_text=fake.text() if fake.boolean() else None,
+            optional_text=fake.text() if random.random() < 0.5 else None,
         )
 
-        # HTTP ingest path
-        try:
-            req = requests.post(
-                "http://localhost:4000/ingest/Foo",
-                data=foo_http.model_dump_json().encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-            )
-            if req.status_code == 200:
-                workflow_table.insert(
-                    [
-                        {
-                            "id": "1",
-                            "success": True,
-                            "message": f"HTTP inserted: {foo_http.primary_key}",
-                        }
-                    ]
-                )
-            else:
-                workflow_table.insert(
-                    [
-                        {
-                            "id": "1",
-                            "success": False,
-                            "message": f"HTTP failed: {req.status_code}",
-                        }
-                    ]
-                )
-        except Exception as e:
-            workflow_table.insert(
-                [{"id": "1", "success": False, "message": f"HTTP error: {e}"}]
-            )
-
-        # Direct stream send path
-        try:
-            foo_pipeline.get_stream().send(foo_send)
-            workflow_table.insert(
-                [
+        payloads.append((foo_http, foo_send))
+
+    http_results = []
+    send_results = []
+
+    # HTTP posts run on a thread pool while the direct stream sends stay on this
+    # thread, so both ingest paths are in flight at the same time
+    with ThreadPoolExecutor(max_workers=_HTTP_WORKERS) as executor:
+        for foo_http, foo_send in payloads:
+            # HTTP ingest path
+            http_results.append(executor.submit(_post_foo, foo_http))
+
+            # Direct stream send path
+            try:
+                foo_pipeline.get_stream().send(foo_send)
+                send_results.append(
                     {
                         "id": "1",
                         "success": True,
                         "message": f"SEND inserted: {foo_send.primary_key}",
                     }
-                ]
-            )
-        except Exception as e:
-            workflow_table.insert(
-                [{"id": "1", "success": False, "message": f"SEND error: {e}"}]
-            )
+                )
+            except Exception as e:
+                send_results.append(
+                    {"id": "1", "success": False, "message": f"SEND error: {e}"}
+                )
+
+    # Status rows are written in batches, in the same HTTP/SEND order as before
+    results = []
+    for http_result, send_result in zip(http_results, send_results):
+        results.append(http_result.result())
+        results.append(send_result)
+        if len(results) >= _INSERT_BATCH_SIZE:
+            workflow_table.insert(results)
+            results = []
+
+    if results:
+        workflow_table.insert(results)
 
 
 ingest_task = Task[None, None](name="task", config=TaskConfig(run=run_task))
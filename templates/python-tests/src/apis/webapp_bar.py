@@ -8,132 +8,253 @@ APIs using the WebApp class.
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from moose_lib.dmv2 import WebApp, WebAppConfig, WebAppMetadata
-from moose_lib.dmv2.web_app_helpers import get_moose_utils
+from moose_lib.dmv2.web_app_helpers import ApiUtil, get_moose_utils
 from src.views.bar_aggregated import barAggregatedMV
-from pydantic import BaseModel, Field
-from typing import Literal
-from datetime import datetime
+from typing import Annotated, Literal
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import msgspec
+import os
+import queue
+import sys
+import time
+
+# Request logs are INFO, so they are filtered out (and never formatted) unless
+# WEBAPP_LOG_LEVEL is lowered from the WARNING default. Records are queued and
+# written to stdout by a background thread; Moose treats unstructured stderr
+# lines as errors.
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get("WEBAPP_LOG_LEVEL", "WARNING").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 app = FastAPI()
 
 
-# Middleware to log requests
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    print(f"[webapp_bar.py] {request.method} {request.url.path}")
-    response = await call_next(request)
-    return response
+# Middleware to log requests and handle unhandled errors
+class LogAndErrorMiddleware:
+    """Plain ASGI middleware that logs each request and turns unhandled
+    exceptions into a JSON 500, so a single layer wraps every request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s %s", scope["method"], scope["path"])
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error("FastAPI error", exc_info=exc)
+            if response_started:
+                raise
+            error_response = JSONResponse(
+                status_code=500,
+                content={
+                    "error": "Internal Server Error",
+                    "message": str(exc),
+                },
+            )
+            await error_response(scope, receive, send)
+
+
+app.add_middleware(LogAndErrorMiddleware)
+
+
+# MooseStack utilities dependency, resolved once per request and shared with
+# sub-dependencies through FastAPI's dependency cache
+async def get_moose(request: Request) -> ApiUtil:
+    """Resolve MooseStack utilities for the current request"""
+    moose = get_moose_utils(request)
+    if not moose:
+        raise HTTPException(
+            status_code=500, detail="MooseStack utilities not available"
+        )
+    return moose
 
 
 # JWT authentication dependency
-async def require_auth(request: Request):
+async def require_auth(moose: ApiUtil = Depends(get_moose)):
     """Require JWT authentication for protected endpoints"""
-    moose = get_moose_utils(request)
-    if not moose or not moose.jwt:
+    if not moose.jwt:
         raise HTTPException(status_code=401, detail="Unauthorized - JWT token required")
     return moose
 
 
+# Last formatted health timestamp as [epoch_second, iso_string]; the payload
+# only has 1-second resolution, so probes within the same second reuse it
+_health_timestamp = [0, ""]
+
+
 # Health check endpoint
 @app.get("/health")
 async def health():
     """Health check endpoint"""
+    now = int(time.time())
+    if now != _health_timestamp[0]:
+        _health_timestamp[0] = now
+        _health_timestamp[1] = datetime.fromtimestamp(now, timezone.utc).isoformat()
     return {
         "status": "ok",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _health_timestamp[1],
         "service": "bar-fastapi-api",
     }
 
 
+# Short-lived /query response cache keyed on limit: bar_aggregated only
+# changes as the MV refreshes, so repeated reads within the TTL skip ClickHouse
+_QUERY_CACHE_TTL_SECONDS = 5.0
+_QUERY_CACHE_MAX_ENTRIES = 128
+_query_cache: dict[int, tuple[float, dict]] = {}
+
+
+# /query text is fixed, so it is built once and limit is bound as a typed
+# ClickHouse query parameter
+_QUERY_SQL = """
+    SELECT
+        day_of_month,
+        total_rows
+    FROM bar_aggregated
+    ORDER BY total_rows DESC
+    LIMIT {limit: UInt32}
+"""
+
+
 # Query endpoint with URL parameters
 @app.get("/query")
-async def query(request: Request, limit: int = 10):
+async def query(limit: int = 10, moose: ApiUtil = Depends(get_moose)):
     """
     Query aggregated bar data.
 
     This endpoint demonstrates:
-    - Accessing MooseStack utilities via get_moose_utils
+    - Accessing MooseStack utilities via a get_moose dependency
     - Using the QueryClient to execute queries
     - Using query parameters for filtering
+    - Caching responses in-process for a few seconds
     """
-    moose = get_moose_utils(request)
-    if not moose:
-        raise HTTPException(
-            status_code=500, detail="MooseStack utilities not available"
-        )
+    now = time.monotonic()
+    cached = _query_cache.get(limit)
+    if cached and cached[0] > now:
+        return cached[1]
 
     try:
-        # Build the query with safe parameterization
-        query_str = """
-            SELECT
-                day_of_month,
-                total_rows
-            FROM bar_aggregated
-            ORDER BY total_rows DESC
-            LIMIT {limit}
-        """
-
-        result = moose.client.query.execute(query_str, {"limit": limit})
+        result = moose.client.query.execute_raw(_QUERY_SQL, {"limit": limit})
 
-        return {
+        response = {
             "success": True,
             "count": len(result),
             "data": result,
         }
+        if len(_query_cache) >= _QUERY_CACHE_MAX_ENTRIES:
+            _query_cache.clear()
+        _query_cache[limit] = (now + _QUERY_CACHE_TTL_SECONDS, response)
+        return response
     except Exception as error:
-        print(f"Query error: {error}")
+        logger.exception("Query error")
         raise HTTPException(status_code=500, detail=str(error))
 
 
 # POST endpoint with request body validation
-class DataRequest(BaseModel):
+class DataRequest(msgspec.Struct):
     """Request body for /data endpoint"""
 
-    order_by: Literal[
-        "total_rows", "rows_with_text", "max_text_length", "total_text_length"
-    ] = Field(default="total_rows", description="Column to order by")
-    limit: int = Field(
-        default=5, gt=0, le=100, description="Number of records to return"
+    order_by: Annotated[
+        Literal["total_rows", "rows_with_text", "max_text_length", "total_text_length"],
+        msgspec.Meta(description="Column to order by"),
+    ] = "total_rows"
+    limit: Annotated[
+        int, msgspec.Meta(gt=0, le=100, description="Number of records to return")
+    ] = 5
+    start_day: Annotated[
+        int, msgspec.Meta(gt=0, le=31, description="Start day of month")
+    ] = 1
+    end_day: Annotated[
+        int, msgspec.Meta(gt=0, le=31, description="End day of month")
+    ] = 31
+
+
+# One prebuilt query per order_by column. The column is bound by the
+# DataRequest Literal, so only numeric filters are passed as query parameters.
+_DATA_QUERIES = {
+    column: f"""
+        SELECT
+            day_of_month,
+            {column}
+        FROM bar_aggregated
+        WHERE
+            day_of_month >= {{start_day: UInt8}}
+            AND day_of_month <= {{end_day: UInt8}}
+        ORDER BY {column} DESC
+        LIMIT {{limit: UInt32}}
+    """
+    for column in (
+        "total_rows",
+        "rows_with_text",
+        "max_text_length",
+        "total_text_length",
     )
-    start_day: int = Field(default=1, gt=0, le=31, description="Start day of month")
-    end_day: int = Field(default=31, gt=0, le=31, description="End day of month")
+}
+
+
+# The body is decoded in a dependency rather than a typed parameter, so FastAPI
+# cannot infer its schema; publish the msgspec one so /docs still documents it
+_, _DATA_REQUEST_SCHEMAS = msgspec.json.schema_components((DataRequest,))
+_DATA_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": _DATA_REQUEST_SCHEMAS["DataRequest"]}
+        },
+    }
+}
+
+
+async def parse_data_request(request: Request) -> DataRequest:
+    """Decode and validate the /data body with msgspec instead of Pydantic"""
+    try:
+        return msgspec.json.decode(await request.body(), type=DataRequest)
+    except msgspec.ValidationError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except msgspec.DecodeError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
 
-@app.post("/data")
-async def data(request: Request, body: DataRequest):
+@app.post("/data", openapi_extra=_DATA_OPENAPI_EXTRA)
+async def data(
+    body: DataRequest = Depends(parse_data_request),
+    moose: ApiUtil = Depends(get_moose),
+):
     """
     Query aggregated bar data with filters.
 
     This endpoint demonstrates:
     - POST request handling
-    - Request body validation with Pydantic
-    - Dynamic query building based on request parameters
+    - Request body validation with msgspec
+    - Selecting a prebuilt query based on request parameters
     """
-    moose = get_moose_utils(request)
-    if not moose:
-        raise HTTPException(
-            status_code=500, detail="MooseStack utilities not available"
-        )
-
     try:
-        # Build the query with safe parameterization
-        query_str = """
-            SELECT
-                day_of_month,
-                {select_column}
-            FROM bar_aggregated
-            WHERE
-                day_of_month >= {start_day}
-                AND day_of_month <= {end_day}
-            ORDER BY {order_by} DESC
-            LIMIT {limit}
-        """
-
-        result = moose.client.query.execute(
-            query_str,
+        result = moose.client.query.execute_raw(
+            _DATA_QUERIES[body.order_by],
             {
-                "select_column": body.order_by,
-                "order_by": body.order_by,
                 "start_day": body.start_day,
                 "end_day": body.end_day,
                 "limit": body.limit,
@@ -152,7 +273,7 @@ async def data(request: Request, body: DataRequest):
             "data": result,
         }
     except Exception as error:
-        print(f"Query error: {error}")
+        logger.exception("Query error")
         raise HTTPException(status_code=500, detail=str(error))
 
 
@@ -173,19 +294,6 @@ async def protected(moose=Depends(require_auth)):
     }
 
 
-# Global error handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    print(f"FastAPI error: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal Server Error",
-            "message": str(exc),
-        },
-    )
-
-
 # Register the FastAPI app as a WebApp
 bar_fastapi_app = WebApp(
     "barFastApi",
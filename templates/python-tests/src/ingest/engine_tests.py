@@ -32,6 +32,9 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Annotated, List
 
+# Shared ZooKeeper/Keeper path prefix for the replicated engine tests below
+_KEEPER_PATH_PREFIX = "/clickhouse/tables/{database}/{shard}/"
+
 
 class EngineTestData(BaseModel):
     """Test data model for engine testing"""
@@ -190,7 +193,7 @@ replicated_merge_tree_table = OlapTable[EngineTestData](
     "ReplicatedMergeTreeTest",
     OlapConfig(
         engine=ReplicatedMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_merge_tree_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_merge_tree_test",
             replica_name="{replica}",
         ),
         order_by_fields=["id", "timestamp"],
@@ -213,7 +216,7 @@ replicated_replacing_merge_tree_table = OlapTable[EngineTestData](
     "ReplicatedReplacingMergeTreeTest",
     OlapConfig(
         engine=ReplicatedReplacingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_replacing_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_replacing_test",
             replica_name="{replica}",
             ver="version",
         ),
@@ -226,7 +229,7 @@ replicated_replacing_soft_delete_table = OlapTable[EngineTestData](
     "ReplicatedReplacingSoftDeleteTest",
     OlapConfig(
         engine=ReplicatedReplacingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_replacing_sd_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_replacing_sd_test",
             replica_name="{replica}",
             ver="version",
             is_deleted="is_deleted",
@@ -240,7 +243,7 @@ replicated_aggregating_merge_tree_table = OlapTable[EngineTestData](
     "ReplicatedAggregatingMergeTreeTest",
     OlapConfig(
         engine=ReplicatedAggregatingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_aggregating_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_aggregating_test",
             replica_name="{replica}",
         ),
         order_by_fields=["id", "category"],
@@ -252,7 +255,7 @@ replicated_summing_merge_tree_table = OlapTable[EngineTestData](
     "ReplicatedSummingMergeTreeTest",
     OlapConfig(
         engine=ReplicatedSummingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_summing_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_summing_test",
             replica_name="{replica}",
             columns=["value"],
         ),
@@ -265,7 +268,7 @@ replicated_collapsing_merge_tree_table = OlapTable[CollapsingTestData](
     "ReplicatedCollapsingMergeTreeTest",
     OlapConfig(
         engine=ReplicatedCollapsingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_collapsing_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_collapsing_test",
             replica_name="{replica}",
             sign="sign",
         ),
@@ -278,7 +281,7 @@ replicated_versioned_collapsing_merge_tree_table = OlapTable[CollapsingTestData]
     "ReplicatedVersionedCollapsingMergeTreeTest",
     OlapConfig(
         engine=ReplicatedVersionedCollapsingMergeTreeEngine(
-            keeper_path="/clickhouse/tables/{database}/{shard}/replicated_versioned_collapsing_test",
+            keeper_path=_KEEPER_PATH_PREFIX + "replicated_versioned_collapsing_test",
             replica_name="{replica}",
             sign="sign",
             ver="version",
@@ -374,7 +377,7 @@ buffer_table = OlapTable[EngineTestData](
 
 # Export all test tables for verification that engine configurations
 # can be properly instantiated and don't throw errors during table creation
-all_engine_test_tables = [
+all_engine_test_tables = (
     merge_tree_table,
     merge_tree_table_expr,
     replacing_merge_tree_basic_table,
@@ -402,4 +405,4 @@ all_engine_test_tables = [
     default_table,
     fixedstring_table,
     comment_codec_table,
-]
+)
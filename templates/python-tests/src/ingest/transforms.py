@@ -1,6 +1,65 @@
 from src.ingest.models import fooModel, barModel, Foo, Bar
 from moose_lib import DeadLetterQueue, DeadLetterModel, TransformConfig, MooseCache
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+import sys
+import time
+from typing import Optional
+
+# Transform diagnostics are queued and written to stdout by a background thread;
+# Moose treats unstructured stderr lines as errors. Set TRANSFORM_LOG_LEVEL=DEBUG
+# to see the per-field DateTime precision output.
+log = logging.getLogger(__name__)
+log.setLevel(os.environ.get("TRANSFORM_LOG_LEVEL", "WARNING").upper())
+log.propagate = False
+_log_queue = queue.Queue(-1)
+log.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_CACHE_KEY_PREFIX = "foo_to_bar:"
+
+# Foo timestamps repeat heavily, and datetimes are immutable, so conversions are memoized
+_timestamp_to_datetime = lru_cache(maxsize=4096)(datetime.fromtimestamp)
+
+# Seconds a transformed Bar stays cached, both in MooseCache and in-process
+_CACHE_TTL_SECONDS = 3600
+
+# Bounded in-process LRU in front of MooseCache so hot keys skip the Redis
+# round-trip. Entries are (deadline, bar) and expire with the MooseCache entry.
+_L1_MAX_ENTRIES = 10_000
+_l1_cache: "OrderedDict[str, tuple[float, Bar]]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _get_cache() -> MooseCache:
+    """Create the MooseCache client on first use and reuse it afterwards"""
+    return MooseCache()
+
+
+def _l1_get(key: str) -> Optional[Bar]:
+    entry = _l1_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _l1_cache[key]
+        return None
+    _l1_cache.move_to_end(key)
+    return entry[1]
+
+
+def _l1_put(key: str, value: Bar) -> None:
+    _l1_cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, value)
+    _l1_cache.move_to_end(key)
+    if len(_l1_cache) > _L1_MAX_ENTRIES:
+        _l1_cache.popitem(last=False)
 
 
 def foo_to_bar(foo: Foo):
@@ -17,27 +76,35 @@ def foo_to_bar(foo: Foo):
     - This enables separate error handling, monitoring, and retry strategies
     """
 
-    # Create a cache
-    cache = MooseCache()
-    cache_key = f"foo_to_bar:{foo.primary_key}"
+    cache_key = _CACHE_KEY_PREFIX + foo.primary_key
 
-    # Checked for cached transformation result
+    # Check the in-process cache, then MooseCache, for a previous result
+    cached_result = _l1_get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    cache = _get_cache()
+    # Not copied into the in-process cache: the remaining MooseCache TTL is
+    # unknown, so a local copy could outlive the MooseCache entry
     cached_result = cache.get(cache_key, type_hint=Bar)
     if cached_result:
         return cached_result
 
     if foo.timestamp == 1728000000.0:  # magic value to test the dead letter queue
         raise ValueError("blah")
-    result = Bar(
+    text = foo.optional_text
+    # Every field comes from an already-validated Foo, so skip re-validation
+    result = Bar.model_construct(
         primary_key=foo.primary_key,
         baz=foo.baz,
-        utc_timestamp=datetime.fromtimestamp(foo.timestamp),
-        has_text=foo.optional_text is not None,
-        text_length=len(foo.optional_text) if foo.optional_text else 0,
+        utc_timestamp=_timestamp_to_datetime(foo.timestamp),
+        has_text=text is not None,
+        text_length=len(text) if text else 0,
     )
 
     # Store the result in cache
-    cache.set(cache_key, result, 3600)  # Cache for 1 hour
+    cache.set(cache_key, result, _CACHE_TTL_SECONDS)  # Cache for 1 hour
+    _l1_put(cache_key, result)
     return result
 
 
@@ -85,10 +152,13 @@ def array_transform(input_data: ArrayInput) -> list[ArrayOutput]:
     """
     # Explode the input array into individual output records
     # Each item in input_data.data becomes a separate Kafka message
+    # All records come from the same input, so they share one timestamp.
+    # The input is already validated, so outputs skip pydantic validation.
+    input_id = input_data.id
+    now = datetime.now()
+    construct = ArrayOutput.model_construct
     return [
-        ArrayOutput(
-            input_id=input_data.id, value=value, index=index, timestamp=datetime.now()
-        )
+        construct(input_id=input_id, value=value, index=index, timestamp=now)
         for index, value in enumerate(input_data.data)
     ]
 
@@ -105,6 +175,13 @@ from src.ingest.models import (
     DateTimePrecisionTestData,
 )
 
+_DATETIME_PRECISION_FIELDS = (
+    "created_at",
+    "timestamp_ms",
+    "timestamp_us",
+    "timestamp_ns",
+)
+
 
 def datetime_precision_transform(
     input_data: DateTimePrecisionTestData,
@@ -115,48 +192,27 @@ def datetime_precision_transform(
     so all datetime fields should be datetime objects with microseconds preserved.
     """
 
-    print("DateTime precision transform (Python) - input types and values:")
-    print(
-        f"  created_at: {type(input_data.created_at)} = {input_data.created_at} (µs: {input_data.created_at.microsecond})"
-    )
-    print(
-        f"  timestamp_ms: {type(input_data.timestamp_ms)} = {input_data.timestamp_ms} (µs: {input_data.timestamp_ms.microsecond})"
-    )
-    print(
-        f"  timestamp_us: {type(input_data.timestamp_us)} = {input_data.timestamp_us} (µs: {input_data.timestamp_us.microsecond})"
-    )
-    print(
-        f"  timestamp_ns: {type(input_data.timestamp_ns)} = {input_data.timestamp_ns} (µs: {input_data.timestamp_ns.microsecond})"
-    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("DateTime precision transform (Python) - input types and values:")
+        for field in _DATETIME_PRECISION_FIELDS:
+            value = getattr(input_data, field)
+            log.debug(
+                "  %s: %s = %s (µs: %s)", field, type(value), value, value.microsecond
+            )
 
     # Verify all are datetime objects
-    if not isinstance(input_data.created_at, datetime):
-        raise TypeError(
-            f"Expected created_at to be datetime, got {type(input_data.created_at)}"
-        )
-    if not isinstance(input_data.timestamp_ms, datetime):
-        raise TypeError(
-            f"Expected timestamp_ms to be datetime, got {type(input_data.timestamp_ms)}"
-        )
-    if not isinstance(input_data.timestamp_us, datetime):
-        raise TypeError(
-            f"Expected timestamp_us to be datetime, got {type(input_data.timestamp_us)}"
-        )
-    if not isinstance(input_data.timestamp_ns, datetime):
-        raise TypeError(
-            f"Expected timestamp_ns to be datetime, got {type(input_data.timestamp_ns)}"
-        )
+    for field in _DATETIME_PRECISION_FIELDS:
+        value = getattr(input_data, field)
+        if not isinstance(value, datetime):
+            raise TypeError(f"Expected {field} to be datetime, got {type(value)}")
 
     # Verify microseconds are present
-    if input_data.timestamp_us.microsecond == 0:
-        print(f"WARNING: timestamp_us has no microseconds: {input_data.timestamp_us}")
-    else:
-        print(f"✓ timestamp_us has microseconds: {input_data.timestamp_us.microsecond}")
-
-    if input_data.timestamp_ns.microsecond == 0:
-        print(f"WARNING: timestamp_ns has no microseconds: {input_data.timestamp_ns}")
-    else:
-        print(f"✓ timestamp_ns has microseconds: {input_data.timestamp_ns.microsecond}")
+    for field in ("timestamp_us", "timestamp_ns"):
+        value = getattr(input_data, field)
+        if value.microsecond == 0:
+            log.warning("%s has no microseconds: %s", field, value)
+        else:
+            log.debug("✓ %s has microseconds: %s", field, value.microsecond)
 
     # Pass through unchanged
     return input_data
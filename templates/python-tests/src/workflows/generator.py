@@ -9,10 +9,39 @@ from moose_lib import (
     TaskContext,
 )
 from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from faker import Faker
 from src.ingest.models import Foo, Baz, fooModel
+import atexit
+import msgspec
+import random
 import requests
+from requests.adapters import HTTPAdapter
+import uuid
+
+# Generator state lives at module scope so task retries in the same worker reuse
+# it; the stream's Kafka producer is likewise memoized by fooModel's Stream.
+# Weighting is irrelevant for synthetic test text.
+_FAKE = Faker(use_weighting=False)
+_BAZ_VALUES = tuple(Baz)
+
+# Use three fixed timestamps for E2E tests to add variability
+# while ensuring predictable results for consumption API tests
+_TIMESTAMPS = (
+    1739865600,  # Oct 19, 2025 00:00:00 UTC (day 19 - the target day for tests)
+    1739952000,  # Oct 20, 2025 00:00:00 UTC (day 20 - should NOT appear in day 19 queries)
+    1740038400,  # Oct 21, 2025 00:00:00 UTC (day 21 - should NOT appear in day 19 queries)
+)
+
+# Number of ingest POSTs kept in flight while the stream sends run
+_HTTP_WORKERS = 16
+
+# Shared HTTP session so the ingest POSTs reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.headers["Content-Type"] = "application/json"
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=_HTTP_WORKERS))
+atexit.register(_SESSION.close)
 
 
 class FooWorkflow(BaseModel):
@@ -23,86 +52,102 @@ class FooWorkflow(BaseModel):
 
 workflow_table = OlapTable[FooWorkflow]("foo_workflow")
 
+# Number of status rows buffered before each workflow_table insert
+_INSERT_BATCH_SIZE = 500
 
-def run_task(ctx: TaskContext[None]) -> None:
-    fake = Faker()
-    # Use three fixed timestamps for E2E tests to add variability
-    # while ensuring predictable results for consumption API tests
-    timestamps = [
-        1739865600,  # Oct 19, 2025 00:00:00 UTC (day 19 - the target day for tests)
-        1739952000,  # Oct 20, 2025 00:00:00 UTC (day 20 - should NOT appear in day 19 queries)
-        1740038400,  # Oct 21, 2025 00:00:00 UTC (day 21 - should NOT appear in day 19 queries)
-    ]
-
-    for i in range(1000):
-        # Cycle through the three timestamps to distribute data across days
-        # This tests that aggregation and filtering work correctly
-        base_ts = timestamps[i % 3]
-
-        # HTTP path payload
-        foo_http = Foo(
-            primary_key=fake.uuid4(),
-            timestamp=base_ts,
-            baz=fake.random_element(Baz),
-            optional_text=("from_http\n" + fake.text()) if fake.boolean() else None,
-        )
 
-        # Direct send payload
-        foo_send = Foo(
-            primary_key=fake.uuid4(),
-            timestamp=base_ts,
-            baz=fake.random_element(Baz),
-            optional_text=("from_send\n" + fake.text()) if fake.boolean() else None,
+def _post_foo(foo: Foo) -> dict:
+    """Send one Foo through the HTTP ingest API and return its status row"""
+    try:
+        req = _SESSION.post(
+            "http://localhost:4000/ingest/Foo",
+            # Same JSON as model_dump_json(), encoded straight to bytes in C
+            data=msgspec.json.encode(
+                {
+                    "primary_key": foo.primary_key,
+                    "timestamp": foo.timestamp,
+                    "baz": foo.baz,
+                    "optional_text": foo.optional_text,
+                }
+            ),
         )
+        if req.status_code == 200:
+            return {
+                "id": "1",
+                "success": True,
+                "message": f"HTTP inserted: {foo.primary_key}",
+            }
+        return {
+            "id": "1",
+            "success": False,
+            "message": f"HTTP failed: {req.status_code}",
+        }
+    except Exception as e:
+        return {"id": "1", "success": False, "message": f"HTTP error: {e}"}
+
+
+def run_task(ctx: TaskContext[None]) -> None:
+    fake = _FAKE
+    http_results = []
+    send_results = []
+
+    # HTTP posts run on a thread pool while the direct stream sends stay on this
+    # thread, so both ingest paths are in flight at the same time
+    with ThreadPoolExecutor(max_workers=_HTTP_WORKERS) as executor:
+        for i in range(1000):
+            # Cycle through the three timestamps to distribute data across days
+            # This tests that aggregation and filtering work correctly
+            base_ts = _TIMESTAMPS[i % 3]
 
-        # HTTP ingest path
-        try:
-            req = requests.post(
-                "http://localhost:4000/ingest/Foo",
-                data=foo_http.model_dump_json().encode("utf-8"),
-                headers={"Content-Type": "application/json"},
+            # HTTP path payload
+            foo_http = Foo(
+                primary_key=str(uuid.uuid4()),
+                timestamp=base_ts,
+                baz=random.choice(_BAZ_VALUES),
+                optional_text=(
+                    ("from_http\n" + fake.text()) if fake.boolean() else None
+                ),
             )
-            if req.status_code == 200:
-                workflow_table.insert(
-                    [
-                        {
-                            "id": "1",
-                            "success": True,
-                            "message": f"HTTP inserted: {foo_http.primary_key}",
-                        }
-                    ]
-                )
-            else:
-                workflow_table.insert(
-                    [
-                        {
-                            "id": "1",
-                            "success": False,
-                            "message": f"HTTP failed: {req.status_code}",
-                        }
-                    ]
-                )
-        except Exception as e:
-            workflow_table.insert(
-                [{"id": "1", "success": False, "message": f"HTTP error: {e}"}]
+
+            # Direct send payload
+            foo_send = Foo(
+                primary_key=str(uuid.uuid4()),
+                timestamp=base_ts,
+                baz=random.choice(_BAZ_VALUES),
+                optional_text=(
+                    ("from_send\n" + fake.text()) if fake.boolean() else None
+                ),
             )
 
-        # Direct stream send path
-        try:
-            fooModel.get_stream().send(foo_send)
-            workflow_table.insert(
-                [
+            # HTTP ingest path
+            http_results.append(executor.submit(_post_foo, foo_http))
+
+            # Direct stream send path
+            try:
+                fooModel.get_stream().send(foo_send)
+                send_results.append(
                     {
                         "id": "1",
                         "success": True,
                         "message": f"SEND inserted: {foo_send.primary_key}",
                     }
-                ]
-            )
-        except Exception as e:
-            workflow_table.insert(
-                [{"id": "1", "success": False, "message": f"SEND error: {e}"}]
-            )
+                )
+            except Exception as e:
+                send_results.append(
+                    {"id": "1", "success": False, "message": f"SEND error: {e}"}
+                )
+
+    # Status rows are written in batches, in the same HTTP/SEND order as before
+    results = []
+    for http_result, send_result in zip(http_results, send_results):
+        results.append(http_result.result())
+        results.append(send_result)
+        if len(results) >= _INSERT_BATCH_SIZE:
+            workflow_table.insert(results)
+            results = []
+
+    if results:
+        workflow_table.insert(results)
 
 
 ingest_task = Task[None, None](name="task", config=TaskConfig(run=run_task))